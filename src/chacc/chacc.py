@@ -38,7 +38,7 @@ from .utils import (
     get_installed_packages
 )
 import logging
-from typing import Optional, Callable, Dict, Set, List
+from typing import Optional, Callable, Dict, Set, List, Union
 from dataclasses import dataclass
 
 
@@ -50,6 +50,7 @@ class Config:
     pre_resolve_hook: Optional[Callable[[str, str], None]] = None
     post_resolve_hook: Optional[Callable[[str, Dict[str, str]], None]] = None
     install_hook: Optional[Callable[[Dict[str, str], Set[str]], bool]] = None
+    max_workers: Optional[int] = None
 
     def create_manager(self) -> DependencyManager:
         """Create a DependencyManager with this configuration."""
@@ -58,7 +59,8 @@ class Config:
             logger=self.logger,
             pre_resolve_hook=self.pre_resolve_hook,
             post_resolve_hook=self.post_resolve_hook,
-            install_hook=self.install_hook
+            install_hook=self.install_hook,
+            max_workers=self.max_workers
         )
 
 
@@ -118,7 +120,7 @@ def invalidate_module_cache(module_name: str, config: Optional[Config] = None):
 
 
 async def re_resolve_dependencies(
-    modules_requirements: Optional[Dict[str, str]] = None,
+    modules_requirements: Optional[Dict[str, Union[str, bytes]]] = None,
     requirements_file_pattern: str = "requirements.txt",
     search_dirs: Optional[List[str]] = None,
     config: Optional[Config] = None
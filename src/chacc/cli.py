@@ -6,11 +6,60 @@ Provides pip-like commands for dependency management with intelligent caching.
 
 import argparse
 import asyncio
+import functools
+import http.client
+import importlib.metadata
+import json
 import sys
 import logging
+import os
+import platform
+import re
+import time
+import traceback
+import urllib.error
+import urllib.request
 from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from .chacc import DependencyManager
+from .manager import read_cache_file
+from .utils import (
+    default_logger,
+    canonicalize_name,
+    canonicalize_names,
+    loads_json,
+    read_json_file,
+    write_json_file
+)
+
+try:
+    from packaging.specifiers import InvalidSpecifier, Specifier, SpecifierSet
+    from packaging.version import InvalidVersion, Version
+except ImportError:
+    Specifier = None
+    Version = None
+
+PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
+PYPI_SIMPLE_URL = "https://pypi.org/simple/{name}/"
+PYPI_SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+PYTHON_VERSION = platform.python_version()
+SDIST_EXTENSIONS = (".tar.gz", ".zip", ".tar.bz2", ".tgz")
+PYPI_TIMEOUT = 60
+LATEST_CACHE_FILE = "pypi_latest.json"
+LATEST_CACHE_TTL = 3600
+# Per-package lookup failures that are reported instead of aborting cmd_outdated
+LOOKUP_ERRORS = (urllib.error.URLError, http.client.HTTPException, OSError, ValueError, KeyError)
+
+_NO_CACHE = "❌ No cached packages found. Run 'cdm install' first."
+_OK_CHECK = "✅ All cached packages are properly installed"
+_OK_OUTDATED = "✅ All cached packages are up-to-date"
+
+# Memoized canonicalize_name, package names repeat across lookups
+_canon = functools.lru_cache(maxsize=4096)(canonicalize_name)
+
+# Splits a version specifier such as '==1.2.3' into operator and version
+_SPEC_RE = re.compile(r'^(==|!=|>=|<=|~=|<|>)\s*(.+)$')
 
 
 def setup_logging(verbose: bool = False):
@@ -22,16 +71,188 @@ def setup_logging(verbose: bool = False):
     )
 
 
+def _latest_from_simple_files(files: List[Dict], python_version: str = PYTHON_VERSION) -> Optional[str]:
+    """
+    Pick the newest non-yanked version from a PEP 691 simple API file list.
+
+    Files whose requires-python excludes python_version are skipped, like pip does.
+    """
+    python_support = {}
+    versions = set()
+    for file_info in files:
+        if file_info.get('yanked'):
+            continue
+        requires_python = file_info.get('requires-python')
+        if requires_python:
+            if requires_python not in python_support:
+                try:
+                    python_support[requires_python] = SpecifierSet(requires_python).contains(
+                        python_version, prereleases=True
+                    )
+                except InvalidSpecifier:
+                    # pip ignores malformed requires-python metadata as well
+                    python_support[requires_python] = True
+            if not python_support[requires_python]:
+                continue
+        filename = file_info.get('filename', '')
+        if filename.endswith('.whl'):
+            version = filename.split('-')[1]
+        else:
+            for extension in SDIST_EXTENSIONS:
+                if filename.endswith(extension):
+                    version = filename[:-len(extension)].rpartition('-')[2]
+                    break
+            else:
+                continue
+        try:
+            versions.add(Version(version))
+        except InvalidVersion:
+            continue
+
+    stable_versions = [version for version in versions if not version.is_prerelease]
+    candidates = stable_versions or versions
+    return str(max(candidates)) if candidates else None
+
+
+def _fetch_latest_from_json_api(name: str) -> Optional[str]:
+    """Return the latest version using the full PyPI JSON API."""
+    url = PYPI_JSON_URL.format(name=_canon(name))
+    try:
+        with urllib.request.urlopen(url, timeout=PYPI_TIMEOUT) as response:
+            data = loads_json(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            # Private or local-only package, nothing to compare against
+            return None
+        raise
+    return data["info"]["version"]
+
+
+def _fetch_latest(name: str) -> Optional[str]:
+    """Return the latest version of a package published on PyPI, or None if unknown."""
+    if Version is None:
+        return _fetch_latest_from_json_api(name)
+
+    # The simple API only lists file names, far smaller than the full JSON metadata
+    request = urllib.request.Request(
+        # Canonical names avoid a redirect for names like 'Django'
+        PYPI_SIMPLE_URL.format(name=_canon(name)),
+        headers={'Accept': PYPI_SIMPLE_JSON}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=PYPI_TIMEOUT) as response:
+            content_type = response.headers.get_content_type()
+            payload = response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+
+    if content_type != PYPI_SIMPLE_JSON:
+        # Index or proxy without PEP 691 support
+        return _fetch_latest_from_json_api(name)
+    return _latest_from_simple_files(loads_json(payload).get('files', []))
+
+
+async def _gather_latest(names: List[str]) -> Tuple[Dict[str, Optional[str]], Dict[str, Exception]]:
+    """
+    Fetch the latest PyPI versions for all packages concurrently.
+
+    Returns the versions that were fetched and the lookup errors per package, so
+    one failed request does not discard the others.
+    """
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[loop.run_in_executor(None, _fetch_latest, name) for name in names],
+        return_exceptions=True
+    )
+
+    versions = {}
+    errors = {}
+    for name, result in zip(names, results):
+        if isinstance(result, LOOKUP_ERRORS):
+            errors[name] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            versions[name] = result
+    return versions, errors
+
+
+def _version_satisfies(installed_version: str, operator: str, version: str) -> bool:
+    """Check an installed version against a single specifier clause."""
+    if Specifier is None:
+        # Without packaging only exact pins can be compared reliably
+        return operator != '==' or installed_version == version
+    try:
+        # Parse explicitly: depending on the packaging release, contains() either
+        # raises InvalidVersion or returns False for non-PEP 440 installed versions
+        Version(installed_version)
+        return Specifier(f"{operator}{version}").contains(installed_version, prereleases=True)
+    except (InvalidSpecifier, InvalidVersion):
+        # Compound or malformed specifiers and unparsable installed versions
+        # (e.g. Debian's '0.23ubuntu1') are not reported as mismatches
+        return True
+
+
+def _is_newer(latest_version: str, current_version: str) -> bool:
+    """Check whether the latest published version is newer than the installed one."""
+    if Version is None:
+        return latest_version != current_version
+    try:
+        return Version(latest_version) > Version(current_version)
+    except InvalidVersion:
+        return False
+
+
+def _print_list(header: str, items: List[str]):
+    """Print a header and bulleted items with a single write."""
+    print("\n".join([header] + [f"   • {item}" for item in items]))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_installed() -> Tuple[FrozenSet[str], Dict[str, str]]:
+    """
+    Snapshot installed distributions once per process.
+
+    Returns the set of canonical names and a canonical name -> version map.
+    """
+    installed_versions = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            # Distributions come in sys.path order; the first one is what imports use
+            installed_versions.setdefault(_canon(name), dist.version)
+    return frozenset(installed_versions), installed_versions
+
+
+def _load_latest_cache(cache_dir: str) -> Dict[str, Dict]:
+    """Load the cached PyPI latest-version lookups."""
+    try:
+        return read_json_file(os.path.join(cache_dir, LATEST_CACHE_FILE))
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def _save_latest_cache(cache_dir: str, latest_cache: Dict[str, Dict]):
+    """Atomically write the PyPI latest-version lookups to the cache directory."""
+    cache_file = os.path.join(cache_dir, LATEST_CACHE_FILE)
+    temp_file = f"{cache_file}.tmp"
+    try:
+        write_json_file(temp_file, latest_cache)
+        os.replace(temp_file, cache_file)
+    except IOError as e:
+        default_logger.warning(f"Failed to save PyPI version cache: {e}")
+
+
 def cmd_install(args):
     """Install packages with dependency resolution."""
-    setup_logging(args.verbose)
-
     dm = DependencyManager(cache_dir=args.cache_dir)
 
     if args.requirements:
-        # Install from requirements file
-        print(f"Installing from {args.requirements}...")
-        requirements = {args.requirements: Path(args.requirements).read_text()}
+        # Install from requirements files, resolved together in one pass
+        print(f"Installing from {', '.join(args.requirements)}...")
+        requirements = {path: Path(path).read_bytes() for path in args.requirements}
         asyncio.run(dm.resolve_dependencies(requirements))
     elif args.packages:
         print(f"Installing packages: {', '.join(args.packages)}...")
@@ -46,12 +267,10 @@ def cmd_install(args):
 
 def cmd_resolve(args):
     """Resolve dependencies without installing."""
-    setup_logging(args.verbose)
-
-    dm = DependencyManager(cache_dir=args.cache_dir)
+    dm = DependencyManager(cache_dir=args.cache_dir, max_workers=args.jobs)
 
     if args.requirements:
-        requirements = {args.requirements: Path(args.requirements).read_text()}
+        requirements = {path: Path(path).read_bytes() for path in args.requirements}
     else:
         requirements = None
 
@@ -67,11 +286,8 @@ def cmd_resolve(args):
 
 def cmd_cache(args):
     """Manage dependency cache."""
-    setup_logging(args.verbose)
-
-    dm = DependencyManager(cache_dir=args.cache_dir)
-
     if args.clear:
+        dm = DependencyManager(cache_dir=args.cache_dir)
         if args.module:
             dm.invalidate_module_cache(args.module)
             print(f"✅ Cleared cache for module: {args.module}")
@@ -79,8 +295,8 @@ def cmd_cache(args):
             dm.invalidate_cache()
             print("✅ Cleared entire dependency cache")
     elif args.info:
-        cache = dm.load_cache()
-        print(f"Cache directory: {dm.cache_dir}")
+        cache = read_cache_file(args.cache_dir)
+        print(f"Cache directory: {os.path.abspath(args.cache_dir)}")
         print(f"Combined hash: {cache.get('combined_hash', 'None')}")
         print(f"Last updated: {cache.get('last_updated', 'Never')}")
         print(f"Resolved packages: {len(cache.get('resolved_packages', {}))}")
@@ -89,141 +305,138 @@ def cmd_cache(args):
 
 def cmd_check(args):
     """Check cached packages against installed packages."""
-    setup_logging(args.verbose)
-
-    dm = DependencyManager(cache_dir=args.cache_dir)
-    cache = dm.load_cache()
+    cache = read_cache_file(args.cache_dir)
 
     resolved_packages = cache.get('resolved_packages', {})
     if not resolved_packages:
-        print("❌ No cached packages found. Run 'cdm install' first.")
+        print(_NO_CACHE)
         return
 
-    from .utils import get_installed_packages, canonicalize_name
-    installed_packages = get_installed_packages()
+    installed_packages, installed_versions = _get_installed()
 
     print(f"Checking {len(resolved_packages)} cached packages against {len(installed_packages)} installed packages...")
 
-    missing_packages = []
-    extra_packages = []
-    version_mismatches = []
+    canonical_names = canonicalize_names([name.partition('[')[0] for name in resolved_packages])
+    cached_specs = dict(zip(canonical_names, resolved_packages.items()))
 
-    for package_name, version_spec in resolved_packages.items():
-        base_name = package_name.split('[')[0] if '[' in package_name else package_name
-        canonical_name = canonicalize_name(base_name)
+    # Set arithmetic on the canonical names runs in C instead of per-package 'in' checks
+    missing_packages = [
+        "".join(cached_specs[canonical_name])
+        for canonical_name in sorted(cached_specs.keys() - installed_packages)
+    ]
 
-        if canonical_name not in installed_packages:
-            missing_packages.append(f"{package_name}{version_spec}")
-        else:
-            # Check version if we have exact version info
-            if version_spec.startswith('=='):
-                expected_version = version_spec[2:]  # Remove '=='
-                # We would need to get the actual installed version to compare
-                # For now, just check presence
-                pass
-
-    # Check for packages installed but not in cache (optional warning)
-    cached_canonical_names = set()
-    for package_name in resolved_packages.keys():
-        base_name = package_name.split('[')[0] if '[' in package_name else package_name
-        cached_canonical_names.add(canonicalize_name(base_name))
-
-    for installed_name in installed_packages:
-        if installed_name not in cached_canonical_names:
-            # Only warn about non-standard packages if requested
-            if args.all:
-                extra_packages.append(installed_name)
+    version_mismatches = []
+    for canonical_name in sorted(cached_specs.keys() & installed_packages):
+        package_name, version_spec = cached_specs[canonical_name]
+        match = _SPEC_RE.match(version_spec)
+        if not match:
+            continue
+        operator, version = match.groups()
+        installed_version = installed_versions[canonical_name]
+        if not _version_satisfies(installed_version, operator, version):
+            expected_version = version if operator == '==' else f"{operator}{version}"
+            version_mismatches.append(
+                f"{package_name}: expected {expected_version}, installed {installed_version}"
+            )
+
+    # Packages installed but not in cache are only reported when requested
+    extra_packages = sorted(installed_packages - cached_specs.keys()) if args.all else []
 
     if not missing_packages and not version_mismatches:
-        print("✅ All cached packages are properly installed")
+        print(_OK_CHECK)
         if extra_packages and args.all:
             print(f"ℹ️  {len(extra_packages)} additional packages installed but not in cache")
     else:
         if missing_packages:
-            print(f"❌ {len(missing_packages)} cached packages are missing:")
-            for package in missing_packages:
-                print(f"   • {package}")
+            _print_list(f"❌ {len(missing_packages)} cached packages are missing:", missing_packages)
 
         if version_mismatches:
-            print(f"⚠️  {len(version_mismatches)} version mismatches found:")
-            for mismatch in version_mismatches:
-                print(f"   • {mismatch}")
+            _print_list(f"⚠️  {len(version_mismatches)} version mismatches found:", version_mismatches)
 
         if extra_packages and args.all:
-            print(f"ℹ️  {len(extra_packages)} additional packages installed but not in cache:")
-            for package in extra_packages:
-                print(f"   • {package}")
+            _print_list(f"ℹ️  {len(extra_packages)} additional packages installed but not in cache:", extra_packages)
 
 
 def cmd_outdated(args):
     """Show packages that have newer versions available."""
-    setup_logging(args.verbose)
-
-    dm = DependencyManager(cache_dir=args.cache_dir)
-    cache = dm.load_cache()
+    cache = read_cache_file(args.cache_dir)
 
     resolved_packages = cache.get('resolved_packages', {})
     if not resolved_packages:
-        print("❌ No cached packages found. Run 'cdm install' first.")
+        print(_NO_CACHE)
         return
 
     print(f"Checking {len(resolved_packages)} packages for available updates...")
 
-    try:
-        import subprocess
-        import sys
-
-        # Use pip list --outdated to get outdated packages
-        result = subprocess.run([
-            sys.executable, '-m', 'pip', 'list', '--outdated', '--format=json'
-        ], capture_output=True, text=True, timeout=60)
-
-        if result.returncode != 0:
-            print(f"❌ Failed to check for outdated packages: {result.stderr}")
-            return
-
-        import json
-        outdated_data = json.loads(result.stdout)
-
-        # Filter to only packages in our cache
-        cached_package_names = set()
-        for package_name in resolved_packages.keys():
-            base_name = package_name.split('[')[0] if '[' in package_name else package_name
-            cached_package_names.add(base_name.lower())
-
-        outdated_cached_packages = []
-        for package_info in outdated_data:
-            package_name = package_info['name'].lower()
-            if package_name in cached_package_names:
-                current_version = package_info['version']
-                latest_version = package_info['latest_version']
-                outdated_cached_packages.append({
-                    'name': package_info['name'],
-                    'current': current_version,
-                    'latest': latest_version
-                })
-
-        if not outdated_cached_packages:
-            print("✅ All cached packages are up-to-date")
-        else:
-            print(f"📦 {len(outdated_cached_packages)} packages have newer versions available:")
-            for package in outdated_cached_packages:
-                print(f"   • {package['name']}: {package['current']} → {package['latest']}")
-
-    except (subprocess.TimeoutExpired, json.JSONDecodeError, KeyError) as e:
-        print(f"❌ Error checking for outdated packages: {e}")
+    installed_packages, installed_versions = _get_installed()
+
+    base_names = [package_name.partition('[')[0] for package_name in resolved_packages]
+
+    current_versions = {}
+    for base_name, canonical_name in zip(base_names, canonicalize_names(base_names)):
+        # Missing packages are reported by 'cdm check', not here
+        if canonical_name in installed_packages:
+            current_versions[base_name] = installed_versions[canonical_name]
+
+    latest_cache = {} if args.refresh else _load_latest_cache(args.cache_dir)
+    expiry = time.time() - LATEST_CACHE_TTL
+    stale_names = [
+        name for name in current_versions
+        if latest_cache.get(name, {}).get('ts', 0) < expiry
+    ]
+
+    failed_lookups = {}
+    if stale_names:
+        fetched_versions, failed_lookups = asyncio.run(_gather_latest(stale_names))
+
+        if fetched_versions:
+            now = time.time()
+            for name, latest_version in fetched_versions.items():
+                latest_cache[name] = {'latest': latest_version, 'ts': now}
+            _save_latest_cache(args.cache_dir, latest_cache)
+
+        if failed_lookups:
+            if len(failed_lookups) == len(current_versions):
+                print(f"❌ Failed to check for outdated packages: {next(iter(failed_lookups.values()))}")
+                return
+            _print_list(
+                f"⚠️  Could not check {len(failed_lookups)} packages:",
+                [f"{name}: {error}" for name, error in failed_lookups.items()]
+            )
+
+    latest_versions = {
+        name: latest_cache[name]['latest']
+        for name in current_versions
+        if name not in failed_lookups
+    }
+
+    outdated_cached_packages = []
+    for package_name, current_version in current_versions.items():
+        latest_version = latest_versions.get(package_name)
+        if latest_version and _is_newer(latest_version, current_version):
+            outdated_cached_packages.append({
+                'name': package_name,
+                'current': current_version,
+                'latest': latest_version
+            })
+
+    if not outdated_cached_packages:
+        print(_OK_OUTDATED)
+    else:
+        _print_list(
+            f"📦 {len(outdated_cached_packages)} packages have newer versions available:",
+            [f"{package['name']}: {package['current']} → {package['latest']}" for package in outdated_cached_packages]
+        )
 
 
 def cmd_upgrade(args):
     """Upgrade packages to their latest versions."""
-    setup_logging(args.verbose)
-
     dm = DependencyManager(cache_dir=args.cache_dir)
 
     if args.requirements:
-        # Upgrade from requirements file
-        print(f"Upgrading from {args.requirements}...")
-        requirements = {args.requirements: Path(args.requirements).read_text()}
+        # Upgrade from requirements files, resolved together in one pass
+        print(f"Upgrading from {', '.join(args.requirements)}...")
+        requirements = {path: Path(path).read_bytes() for path in args.requirements}
         asyncio.run(dm.upgrade_dependencies(requirements))
     elif args.packages:
         print(f"Upgrading packages: {', '.join(args.packages)}...")
@@ -238,8 +451,6 @@ def cmd_upgrade(args):
 
 def cmd_demo(args):
     """Run demonstration scripts to show ChaCC features."""
-    setup_logging(args.verbose)
-
     if args.type == 'modules':
         print("🚀 Running module separation demo...")
         from .demo_module_separation import demo_module_separation
@@ -254,7 +465,29 @@ def cmd_demo(args):
         print("  cdm demo cache    - Show cache structure and organization")
 
 
+def _positive_int(value: str) -> int:
+    """Argparse type for options that require an integer greater than zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+_PARSER = None
+
+
 def create_parser():
+    """Return the argument parser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+
+def _build_parser():
     """Create the argument parser."""
     parser = argparse.ArgumentParser(
         description="Intelligent dependency management with caching",
@@ -286,7 +519,8 @@ def create_parser():
     )
     install_parser.add_argument(
         "-r", "--requirements",
-        help="Install from requirements file"
+        action="append",
+        help="Install from requirements file (can be repeated)"
     )
     install_parser.set_defaults(func=cmd_install)
 
@@ -301,7 +535,8 @@ def create_parser():
     )
     upgrade_parser.add_argument(
         "-r", "--requirements",
-        help="Upgrade from requirements file"
+        action="append",
+        help="Upgrade from requirements file (can be repeated)"
     )
     upgrade_parser.set_defaults(func=cmd_upgrade)
 
@@ -311,7 +546,8 @@ def create_parser():
     )
     resolve_parser.add_argument(
         "-r", "--requirements",
-        help="Requirements file to resolve"
+        action="append",
+        help="Requirements file to resolve (can be repeated)"
     )
     resolve_parser.add_argument(
         "-p", "--pattern",
@@ -323,6 +559,11 @@ def create_parser():
         nargs="*",
         help="Directories to search for requirements files"
     )
+    resolve_parser.add_argument(
+        "-j", "--jobs",
+        type=_positive_int,
+        help="Maximum number of requirements files to resolve in parallel (default: automatic)"
+    )
     resolve_parser.set_defaults(func=cmd_resolve)
 
     cache_parser = subparsers.add_parser(
@@ -360,6 +601,11 @@ def create_parser():
         "outdated",
         help="Show which packages have newer versions available"
     )
+    outdated_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached PyPI lookups and query every package again"
+    )
     outdated_parser.set_defaults(func=cmd_outdated)
 
     demo_parser = subparsers.add_parser(
@@ -380,6 +626,7 @@ def main():
     """Main CLI entry point."""
     parser = create_parser()
     args = parser.parse_args()
+    setup_logging(getattr(args, 'verbose', False))
 
     if not args.command:
         parser.print_help()
@@ -394,7 +641,6 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         if args.verbose:
-            import traceback
             traceback.print_exc()
         return 1
 
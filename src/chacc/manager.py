@@ -7,10 +7,13 @@ Provides intelligent, incremental dependency resolution and caching for modular
 import os
 import json
 import glob
+import asyncio
 import logging
 import subprocess
 import sys
-from typing import Dict, Set, Optional, Callable, List
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Set, Optional, Callable, List, Tuple, Union
 
 from .utils import (
     default_logger,
@@ -18,9 +21,29 @@ from .utils import (
     calculate_combined_requirements_hash,
     get_environment_hash,
     get_installed_packages,
-    canonicalize_name
+    canonicalize_name,
+    decode_requirements,
+    read_json_file,
+    write_json_file
 )
 
+CACHE_FILE = "dependency_cache.json"
+
+# Upper bound on concurrent 'pip wheel' processes, independent of max_workers
+WHEEL_PREFETCH_WORKERS = 4
+
+
+def read_cache_file(cache_dir: str, logger: logging.Logger = default_logger) -> Dict:
+    """Read the raw dependency cache in cache_dir, or {} if it is missing or unreadable."""
+    cache_file = os.path.join(cache_dir, CACHE_FILE)
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        return read_json_file(cache_file)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning(f"Failed to load dependency cache: {e}")
+        return {}
+
 
 class DependencyManager:
     """
@@ -33,12 +56,17 @@ class DependencyManager:
     and does not have any external dependencies. It can be extended with custom
     hooks for integration with other systems.
 
+    Changed requirement sets are resolved concurrently on worker threads, so
+    pre_resolve_hook and post_resolve_hook may run on a thread other than the
+    caller's and at the same time for different modules; hooks must be thread-safe.
+
     Args:
         cache_dir: Directory for dependency cache files (default: ".dependency_cache")
         logger: Logger instance to use (default: built-in logging)
         pre_resolve_hook: Optional callback called before dependency resolution
         post_resolve_hook: Optional callback called after dependency resolution
         install_hook: Optional callback for custom package installation logic
+        max_workers: Maximum number of requirement sets resolved in parallel (default: automatic)
     """
 
     def __init__(
@@ -47,35 +75,33 @@ class DependencyManager:
         logger: Optional[logging.Logger] = None,
         pre_resolve_hook: Optional[Callable[[str, str], None]] = None,
         post_resolve_hook: Optional[Callable[[str, Dict[str, str]], None]] = None,
-        install_hook: Optional[Callable[[Dict[str, str], Set[str]], bool]] = None
+        install_hook: Optional[Callable[[Dict[str, str], Set[str]], bool]] = None,
+        max_workers: Optional[int] = None
     ):
         """Initialize the dependency manager with configurable paths and hooks."""
         self.cache_dir = os.path.abspath(cache_dir or ".dependency_cache")
-        self.cache_file = os.path.join(self.cache_dir, "dependency_cache.json")
+        self.cache_file = os.path.join(self.cache_dir, CACHE_FILE)
 
         self.logger = logger or default_logger
 
         self.pre_resolve_hook = pre_resolve_hook
         self.post_resolve_hook = post_resolve_hook
         self.install_hook = install_hook
+        self.max_workers = max_workers
 
         os.makedirs(self.cache_dir, exist_ok=True)
 
     def load_cache(self) -> Dict:
         """Load dependency cache from file."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    cache = json.load(f)
-                    if 'requirements_caches' not in cache:
-                        cache['requirements_caches'] = {}
-                    if 'combined_hash' not in cache:
-                        cache['combined_hash'] = None
-                    if 'environment_hash' not in cache:
-                        cache['environment_hash'] = None
-                    return cache
-            except (json.JSONDecodeError, IOError) as e:
-                self.logger.warning(f"Failed to load dependency cache: {e}")
+        cache = read_cache_file(self.cache_dir, self.logger)
+        if cache:
+            if 'requirements_caches' not in cache:
+                cache['requirements_caches'] = {}
+            if 'combined_hash' not in cache:
+                cache['combined_hash'] = None
+            if 'environment_hash' not in cache:
+                cache['environment_hash'] = None
+            return cache
         return {
             'requirements_caches': {},
             'backbone_hash': None,
@@ -89,8 +115,7 @@ class DependencyManager:
         """Save dependency cache to file."""
         try:
             os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            write_json_file(self.cache_file, cache_data)
         except IOError as e:
             self.logger.error(f"Failed to save dependency cache: {e}")
 
@@ -139,10 +164,13 @@ class DependencyManager:
             except Exception as e:
                 self.logger.warning(f"Pre-resolve hook failed: {e}")
 
-        temp_req_file = os.path.join(os.path.dirname(self.cache_file), f"temp_{module_name}_requirements.txt")
+        # A unique file per call: module names may repeat (e.g. several discovered
+        # requirements.txt) and modules are resolved concurrently
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_req_file = tempfile.mkstemp(dir=self.cache_dir, prefix="temp_", suffix="_requirements.txt")
 
         try:
-            with open(temp_req_file, "w") as f:
+            with os.fdopen(fd, "w") as f:
                 f.write(requirements_content)
 
             cmd = [
@@ -192,6 +220,26 @@ class DependencyManager:
                 if os.path.exists(file):
                     os.remove(file)
 
+    async def _resolve_modules(self, requirements: List[Tuple[str, str]], upgrade: bool = False) -> List[Dict[str, str]]:
+        """
+        Resolve independent requirement sets concurrently.
+
+        Each set is compiled by its own pip-compile process, so the blocking calls
+        run in a thread pool of up to max_workers threads and overlap their
+        network and disk I/O. Results are returned in the same order as the input.
+        """
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            async def resolve(req_name: str, req_content: str) -> Dict[str, str]:
+                if not req_content.strip():
+                    return {}
+                return await loop.run_in_executor(
+                    executor, self.resolve_module_dependencies, req_name, req_content, upgrade
+                )
+
+            return await asyncio.gather(*[resolve(name, content) for name, content in requirements])
+
     def merge_resolved_packages(self, *package_dicts: Dict[str, str]) -> Dict[str, str]:
         """Merge multiple resolved package dictionaries, resolving conflicts."""
         merged = {}
@@ -239,6 +287,10 @@ class DependencyManager:
             for package_name in packages_to_install:
                 self.logger.info(f"     ✓ {package_name}")
             try:
+                if len(packages_to_install) > 1 and self._install_from_prefetched_wheels(packages_to_install):
+                    self.logger.info("Package installation completed successfully")
+                    return
+
                 batch_size = 50
                 for i in range(0, len(packages_to_install), batch_size):
                     batch = packages_to_install[i:i + batch_size]
@@ -257,9 +309,73 @@ class DependencyManager:
         else:
             self.logger.info("All required packages are already installed")
 
+    def _install_from_prefetched_wheels(self, packages: List[str]) -> bool:
+        """
+        Fetch wheels for pinned packages concurrently, then install them in one step.
+
+        Wheels are fetched and installed with --no-deps. Only missing packages are
+        installed, so a resolved dependency that is present at an incompatible
+        version would not be corrected. 'pip check' runs before and after the
+        install, and only problems the install introduced count as a failure.
+        Returns False if any step fails so the caller can fall back to
+        a regular pip install, which resolves and repairs dependencies.
+        """
+        def fetch_wheel(package: str, wheel_dir: str) -> subprocess.CompletedProcess:
+            return subprocess.run([
+                sys.executable, '-m', 'pip', 'wheel', '--quiet', '--no-deps',
+                '--wheel-dir', wheel_dir, package
+            ], capture_output=True, text=True, timeout=300)
+
+        with tempfile.TemporaryDirectory(dir=self.cache_dir, prefix="wheels_") as wheel_dir:
+            try:
+                workers = min(len(packages), WHEEL_PREFETCH_WORKERS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(lambda package: fetch_wheel(package, wheel_dir), packages))
+            except subprocess.TimeoutExpired:
+                self.logger.warning("Timed out fetching wheels, falling back to regular pip install")
+                return False
+
+            failed = [result for result in results if result.returncode != 0]
+            if failed:
+                self.logger.warning(f"Failed to fetch {len(failed)} wheel(s), falling back to regular pip install")
+                self.logger.debug(failed[0].stderr)
+                return False
+
+            # Conflicts that already exist are not caused by this install
+            problems_before = self._pip_check_problems()
+
+            result = subprocess.run([
+                sys.executable, '-m', 'pip', 'install', '--quiet', '--no-deps',
+                '--no-index', '--find-links', wheel_dir
+            ] + packages, capture_output=True, text=True, timeout=300)
+
+            if result.returncode != 0:
+                self.logger.warning(f"Failed to install prefetched wheels, falling back to regular pip install: {result.stderr}")
+                return False
+
+        new_problems = self._pip_check_problems() - problems_before
+        if new_problems:
+            self.logger.warning(
+                "Wheel install left inconsistent dependencies, falling back to regular pip install: "
+                + "; ".join(sorted(new_problems))
+            )
+            return False
+
+        return True
+
+    def _pip_check_problems(self) -> Set[str]:
+        """Return the dependency problems currently reported by 'pip check'."""
+        result = subprocess.run([
+            sys.executable, '-m', 'pip', 'check'
+        ], capture_output=True, text=True, timeout=300)
+
+        if result.returncode == 0:
+            return set()
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+
     async def resolve_dependencies(
         self,
-        modules_requirements: Optional[Dict[str, str]] = None,
+        modules_requirements: Optional[Dict[str, Union[str, bytes]]] = None,
         requirements_file_pattern: str = "requirements.txt",
         search_dirs: Optional[List[str]] = None
     ):
@@ -273,7 +389,7 @@ class DependencyManager:
         4. Installs only missing packages
 
         Args:
-            modules_requirements: Dict of name -> requirements_content
+            modules_requirements: Dict of name -> requirements_content (str or bytes)
                                   If None, auto-discovers from filesystem
             requirements_file_pattern: Glob pattern for requirements files (default: "requirements.txt")
             search_dirs: List of directories to search for requirements files (default: current dir)
@@ -281,7 +397,10 @@ class DependencyManager:
         self.logger.info("Starting incremental dependency resolution...")
 
         if modules_requirements:
-            requirements_to_process = list(modules_requirements.items())
+            requirements_to_process = [
+                (req_name, decode_requirements(req_content))
+                for req_name, req_content in modules_requirements.items()
+            ]
         else:
             requirements_to_process = []
             search_dirs = search_dirs or ["."]
@@ -345,7 +464,7 @@ class DependencyManager:
                     self.logger.debug(f"Found {len(installed_packages)} installed packages")
                     missing_packages = []
                     for package_name in cached_packages.keys():
-                        base_name = package_name.split('[')[0] if '[' in package_name else package_name
+                        base_name = package_name.partition('[')[0]
                         canonical_name = canonicalize_name(base_name)
                         if canonical_name not in installed_packages:
                             missing_packages.append(package_name)
@@ -366,15 +485,14 @@ class DependencyManager:
                 self.logger.info(f"🔄 Requirements changed: Re-resolving dependencies for {len(requirements_needing_resolution)} module(s): {', '.join(changed_modules)}")
 
             if requirements_needing_resolution:
+                module_results = await self._resolve_modules(requirements_needing_resolution, upgrade=False)
                 resolved_packages = {}
-                for req_name, req_content in requirements_needing_resolution:
-                    if req_content.strip():
-                        req_packages = self.resolve_module_dependencies(req_name, req_content, upgrade=False)
-                        resolved_packages.update(req_packages)
+                for (req_name, req_content), req_packages in zip(requirements_needing_resolution, module_results):
+                    resolved_packages.update(req_packages)
 
                     req_caches[req_name] = {
                         'hash': current_req_hashes.get(req_name),
-                        'packages': req_packages if req_content.strip() else {},
+                        'packages': req_packages,
                         'last_updated': str(os.path.getmtime(os.path.join(self.cache_dir, '..')))  # Rough timestamp
                     }
 
@@ -415,7 +533,7 @@ class DependencyManager:
 
     async def upgrade_dependencies(
         self,
-        modules_requirements: Optional[Dict[str, str]] = None,
+        modules_requirements: Optional[Dict[str, Union[str, bytes]]] = None,
         requirements_file_pattern: str = "requirements.txt",
         search_dirs: Optional[List[str]] = None
     ):
@@ -426,7 +544,7 @@ class DependencyManager:
         invalidates the cache, and installs the upgraded packages.
 
         Args:
-            modules_requirements: Dict of name -> requirements_content
+            modules_requirements: Dict of name -> requirements_content (str or bytes)
                                    If None, auto-discovers from filesystem
             requirements_file_pattern: Glob pattern for requirements files (default: "requirements.txt")
             search_dirs: List of directories to search for requirements files (default: current dir)
@@ -437,7 +555,10 @@ class DependencyManager:
         self.invalidate_cache()
 
         if modules_requirements:
-            requirements_to_process = list(modules_requirements.items())
+            requirements_to_process = [
+                (req_name, decode_requirements(req_content))
+                for req_name, req_content in modules_requirements.items()
+            ]
         else:
             requirements_to_process = []
             search_dirs = search_dirs or ["."]
@@ -467,10 +588,8 @@ class DependencyManager:
 
         try:
             resolved_packages = {}
-            for req_name, req_content in requirements_to_process:
-                if req_content.strip():
-                    req_packages = self.resolve_module_dependencies(req_name, req_content, upgrade=True)
-                    resolved_packages.update(req_packages)
+            for req_packages in await self._resolve_modules(requirements_to_process, upgrade=True):
+                resolved_packages.update(req_packages)
 
             if resolved_packages:
                 installed_packages = get_installed_packages()
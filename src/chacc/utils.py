@@ -5,17 +5,27 @@ Provides logging setup, hash calculations, and package management utilities.
 """
 
 import hashlib
+import json
 import logging
 import platform
+import re
 import subprocess
 import sys
-from typing import Dict, Set
+from typing import Any, Dict, List, Set, Union
+
+# PEP 503 normalization: runs of '-', '_' and '.' collapse to a single '-'
+_CANONICAL_SEPARATORS = re.compile(r"[-_.]+")
 
 try:
     from packaging.utils import canonicalize_name
 except ImportError:
     def canonicalize_name(name: str) -> str:
-        return name.replace('_', '-').lower()
+        return _CANONICAL_SEPARATORS.sub('-', name).lower()
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 default_logger = logging.getLogger('dependency_manager')
@@ -27,6 +37,53 @@ if not default_logger.handlers:
     default_logger.addHandler(handler)
 
 
+def canonicalize_names(names: List[str]) -> List[str]:
+    """
+    Canonicalize many package names at once.
+
+    Names never contain newlines, so they are joined and normalized with a single
+    regex substitution and lower() call instead of one call per name.
+    """
+    if not names:
+        return []
+    return _CANONICAL_SEPARATORS.sub('-', "\n".join(names)).lower().split("\n")
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json_file(path: str) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def write_json_file(path: str, data: Any):
+    """Serialize data as indented JSON and write it to path."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+
+def decode_requirements(requirements_content: Union[str, bytes]) -> str:
+    """
+    Return requirements content as text, decoding raw file bytes if needed.
+
+    Line endings are normalized to '\n' like Path.read_text() does, so CRLF files
+    hash the same whether they were passed as bytes or text.
+    """
+    if isinstance(requirements_content, bytes):
+        requirements_content = requirements_content.decode('utf-8', 'replace')
+    return requirements_content.replace('\r\n', '\n').replace('\r', '\n')
+
+
 def get_environment_hash() -> str:
     """Calculate hash of the current environment (Python version and OS)."""
     python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
@@ -52,20 +109,20 @@ def calculate_combined_requirements_hash(module_hashes: Dict[str, str]) -> str:
 def get_installed_packages() -> Set[str]:
     """Get set of currently installed packages (canonicalized names)."""
     try:
+        # Keep the output as bytes: only the package names need decoding
         result = subprocess.run([
             sys.executable, '-m', 'pip', 'list', '--format=freeze'
-        ], capture_output=True, text=True, timeout=30)
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
 
         if result.returncode == 0:
             packages = set()
-            for line in result.stdout.strip().split('\n'):
-                if '==' in line:
-                    package_name = line.split('==')[0]
-                    canonical_name = canonicalize_name(package_name)
-                    packages.add(canonical_name)
+            for line in result.stdout.splitlines():
+                package_name, separator, _ = line.partition(b'==')
+                if separator:
+                    packages.add(canonicalize_name(package_name.decode()))
             return packages
         else:
-            default_logger.warning(f"Failed to get installed packages: {result.stderr}")
+            default_logger.warning(f"Failed to get installed packages: {result.stderr.decode(errors='replace')}")
             return set()
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
         default_logger.warning(f"Error getting installed packages: {e}")
@@ -0,0 +1,21 @@
+"""
+Test batch package name canonicalization.
+"""
+
+import sys
+sys.path.insert(0, 'src')
+
+from chacc.utils import canonicalize_name, canonicalize_names
+
+
+def test_canonicalize_names_matches_single_name():
+    """Test that batch canonicalization matches canonicalize_name per name."""
+    names = ['Django', 'zope.interface', 'typing_extensions', 'Foo__Bar-.baz', 'requests']
+
+    assert canonicalize_names(names) == [canonicalize_name(name) for name in names]
+    assert canonicalize_names(names) == ['django', 'zope-interface', 'typing-extensions', 'foo-bar-baz', 'requests']
+
+
+def test_canonicalize_names_empty():
+    """Test that an empty list is returned unchanged."""
+    assert canonicalize_names([]) == []
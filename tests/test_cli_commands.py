@@ -4,15 +4,18 @@ Test CLI commands for visibility features.
 
 import sys
 import os
+import http.client
+import importlib.metadata
 import json
 import tempfile
-import subprocess
+import time
+import urllib.error
 from unittest.mock import patch, MagicMock
 import pytest
 
 sys.path.insert(0, 'src')
 
-from chacc.cli import cmd_check, cmd_outdated
+from chacc.cli import cmd_check, cmd_outdated, cmd_resolve, create_parser, _fetch_latest, _get_installed, _latest_from_simple_files
 from chacc import DependencyManager
 
 
@@ -22,6 +25,12 @@ class MockArgs:
         self.cache_dir = kwargs.get('cache_dir', '.dependency_cache')
         self.verbose = kwargs.get('verbose', False)
         self.all = kwargs.get('all', False)
+        self.refresh = kwargs.get('refresh', False)
+
+
+def installed_snapshot(versions):
+    """Build the (names, versions) pair returned by chacc.cli._get_installed."""
+    return frozenset(versions), versions
 
 
 def test_cmd_check_no_cache():
@@ -51,7 +60,7 @@ def test_cmd_check_all_packages_installed():
 
         args = MockArgs(cache_dir=temp_dir)
 
-        with patch('chacc.utils.get_installed_packages', return_value={'requests', 'packaging'}), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot({'requests': '2.28.0', 'packaging': '21.3'})), \
              patch('builtins.print') as mock_print:
 
             cmd_check(args)
@@ -76,7 +85,7 @@ def test_cmd_check_missing_packages():
 
         args = MockArgs(cache_dir=temp_dir)
 
-        with patch('chacc.utils.get_installed_packages', return_value={'requests', 'packaging'}), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot({'requests': '2.28.0', 'packaging': '21.3'})), \
              patch('builtins.print') as mock_print:
 
             cmd_check(args)
@@ -85,6 +94,83 @@ def test_cmd_check_missing_packages():
         assert any("missing-package==1.0.0" in str(call) for call in mock_print.call_args_list)
 
 
+def test_cmd_check_version_mismatch():
+    """Test check command reports pinned packages installed at another version."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'requests': '==2.28.0',
+                'packaging': '==21.3'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        args = MockArgs(cache_dir=temp_dir)
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot({'requests': '2.31.0', 'packaging': '21.3'})), \
+             patch('builtins.print') as mock_print:
+
+            cmd_check(args)
+
+        assert any("⚠️  1 version mismatches found:" in str(call) for call in mock_print.call_args_list)
+        assert any("requests: expected 2.28.0, installed 2.31.0" in str(call) for call in mock_print.call_args_list)
+
+
+def test_cmd_check_version_ranges():
+    """Test check command compares non-exact specifiers against installed versions."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'requests': '>=2.28',
+                'packaging': '~=21.0',
+                'urllib3': '<2'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        args = MockArgs(cache_dir=temp_dir)
+
+        installed = {'requests': '2.31.0', 'packaging': '21.3', 'urllib3': '2.0.7'}
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('builtins.print') as mock_print:
+
+            cmd_check(args)
+
+        assert any("⚠️  1 version mismatches found:" in str(call) for call in mock_print.call_args_list)
+        assert any("urllib3: expected <2, installed 2.0.7" in str(call) for call in mock_print.call_args_list)
+
+
+def test_cmd_check_unparsable_installed_version():
+    """Test check command tolerates installed versions that are not PEP 440."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'python-apt': '>=0.1',
+                'requests': '==2.28.0'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        installed = {'python-apt': '0.23ubuntu1', 'requests': '2.28.0'}
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('builtins.print') as mock_print:
+
+            cmd_check(MockArgs(cache_dir=temp_dir))
+
+        assert any("✅ All cached packages are properly installed" in str(call) for call in mock_print.call_args_list)
+
+
 def test_cmd_check_with_extra_packages():
     """Test check command with --all flag showing extra installed packages."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -100,7 +186,7 @@ def test_cmd_check_with_extra_packages():
 
         args = MockArgs(cache_dir=temp_dir, all=True)
 
-        with patch('chacc.utils.get_installed_packages', return_value={'requests', 'extra-package'}), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot({'requests': '2.28.0', 'extra-package': '1.0.0'})), \
              patch('builtins.print') as mock_print:
 
             cmd_check(args)
@@ -136,11 +222,10 @@ def test_cmd_outdated_no_outdated_packages():
 
         args = MockArgs(cache_dir=temp_dir)
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = '[]'
+        installed = {'requests': '2.28.0', 'packaging': '21.3'}
 
-        with patch('subprocess.run', return_value=mock_result), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', side_effect=installed.get), \
              patch('builtins.print') as mock_print:
 
             cmd_outdated(args)
@@ -164,32 +249,127 @@ def test_cmd_outdated_with_outdated_packages():
 
         args = MockArgs(cache_dir=temp_dir)
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps([
-            {
-                'name': 'requests',
-                'version': '2.28.0',
-                'latest_version': '2.31.0'
-            },
-            {
-                'name': 'some-other-package',
-                'version': '1.0.0',
-                'latest_version': '2.0.0'
-            }
-        ])
+        installed = {'requests': '2.28.0', 'packaging': '21.3'}
+        latest = {'requests': '2.31.0', 'packaging': '21.3'}
 
-        with patch('subprocess.run', return_value=mock_result), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', side_effect=latest.get) as mock_fetch, \
              patch('builtins.print') as mock_print:
 
             cmd_outdated(args)
 
+        assert sorted(call.args[0] for call in mock_fetch.call_args_list) == ['packaging', 'requests']
         assert any("📦 1 packages have newer versions available:" in str(call) for call in mock_print.call_args_list)
         assert any("requests: 2.28.0 → 2.31.0" in str(call) for call in mock_print.call_args_list)
 
 
-def test_cmd_outdated_pip_error():
-    """Test outdated command when pip command fails."""
+def test_cmd_outdated_ignores_newer_installed_versions():
+    """Test outdated command does not report dev, local or newer installs as outdated."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'foo': '==2.1.0.dev0',
+                'requests': '==2.31.0',
+                'packaging': '==21.3'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        installed = {'foo': '2.1.0.dev0', 'requests': '2.31.0+local', 'packaging': 'not-a-version'}
+        latest = {'foo': '2.0.0', 'requests': '2.31.0', 'packaging': '21.3'}
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', side_effect=latest.get), \
+             patch('builtins.print') as mock_print:
+
+            cmd_outdated(MockArgs(cache_dir=temp_dir))
+
+        assert any("✅ All cached packages are up-to-date" in str(call) for call in mock_print.call_args_list)
+
+
+def test_cmd_outdated_uses_latest_version_cache():
+    """Test outdated command only queries PyPI for stale or missing cache entries."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'requests': '==2.28.0',
+                'packaging': '==21.3'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        latest_cache_file = os.path.join(temp_dir, 'pypi_latest.json')
+        with open(latest_cache_file, 'w') as f:
+            json.dump({'requests': {'latest': '2.31.0', 'ts': time.time()}}, f)
+
+        installed = {'requests': '2.28.0', 'packaging': '21.3'}
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', return_value='21.3') as mock_fetch, \
+             patch('builtins.print') as mock_print:
+
+            cmd_outdated(args=MockArgs(cache_dir=temp_dir))
+
+        mock_fetch.assert_called_once_with('packaging')
+        assert any("requests: 2.28.0 → 2.31.0" in str(call) for call in mock_print.call_args_list)
+
+        with open(latest_cache_file) as f:
+            assert json.load(f)['packaging']['latest'] == '21.3'
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', return_value=None) as mock_fetch, \
+             patch('builtins.print'):
+
+            cmd_outdated(args=MockArgs(cache_dir=temp_dir, refresh=True))
+
+        assert mock_fetch.call_count == 2
+
+
+def test_cmd_outdated_partial_lookup_failure():
+    """Test outdated command reports and caches successful lookups when one fails."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_data = {
+            'resolved_packages': {
+                'requests': '==2.28.0',
+                'packaging': '==21.3',
+                'idna': '==3.6'
+            }
+        }
+
+        cache_file = os.path.join(temp_dir, 'dependency_cache.json')
+        with open(cache_file, 'w') as f:
+            json.dump(cache_data, f)
+
+        installed = {'requests': '2.28.0', 'packaging': '21.3', 'idna': '3.6'}
+
+        def fetch(name):
+            if name == 'packaging':
+                raise urllib.error.HTTPError('url', 503, 'Service Unavailable', None, None)
+            if name == 'idna':
+                raise http.client.IncompleteRead(b'{"files": [')
+            return '2.31.0'
+
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot(installed)), \
+             patch('chacc.cli._fetch_latest', side_effect=fetch), \
+             patch('builtins.print') as mock_print:
+
+            cmd_outdated(MockArgs(cache_dir=temp_dir))
+
+        assert any("Could not check 2 packages" in str(call) for call in mock_print.call_args_list)
+        assert any("requests: 2.28.0 → 2.31.0" in str(call) for call in mock_print.call_args_list)
+
+        with open(os.path.join(temp_dir, 'pypi_latest.json')) as f:
+            assert list(json.load(f)) == ['requests']
+
+
+def test_cmd_outdated_network_error():
+    """Test outdated command when PyPI cannot be reached."""
     with tempfile.TemporaryDirectory() as temp_dir:
         cache_data = {
             'resolved_packages': {
@@ -203,11 +383,8 @@ def test_cmd_outdated_pip_error():
 
         args = MockArgs(cache_dir=temp_dir)
 
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stderr = 'pip list failed'
-
-        with patch('subprocess.run', return_value=mock_result), \
+        with patch('chacc.cli._get_installed', return_value=installed_snapshot({'requests': '2.28.0'})), \
+             patch('urllib.request.urlopen', side_effect=urllib.error.URLError('no network')), \
              patch('builtins.print') as mock_print:
 
             cmd_outdated(args)
@@ -215,5 +392,125 @@ def test_cmd_outdated_pip_error():
         assert any("❌ Failed to check for outdated packages:" in str(call) for call in mock_print.call_args_list)
 
 
+def test_get_installed_prefers_first_distribution_on_path():
+    """Test that a shadowed duplicate installation does not override the active one."""
+    with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+        for site_dir, version in ((first_dir, '1.0'), (second_dir, '2.0')):
+            dist_info = os.path.join(site_dir, f'foo-{version}.dist-info')
+            os.makedirs(dist_info)
+            with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+                f.write(f"Metadata-Version: 2.1\nName: foo\nVersion: {version}\n")
+
+        distributions = importlib.metadata.distributions(path=[first_dir, second_dir])
+        with patch('importlib.metadata.distributions', return_value=distributions):
+            installed_packages, installed_versions = _get_installed.__wrapped__()
+
+        assert 'foo' in installed_packages
+        assert installed_versions['foo'] == '1.0'
+
+
+def test_latest_from_simple_files():
+    """Test latest version selection from a PEP 691 file listing."""
+    files = [
+        {'filename': 'requests-2.30.0.tar.gz'},
+        {'filename': 'requests-2.31.0-py3-none-any.whl'},
+        {'filename': 'requests-2.32.0-py3-none-any.whl', 'yanked': 'broken release'},
+        {'filename': 'requests-3.0.0rc1.tar.gz'},
+        {'filename': 'requests-2.31.0.tar.gz.asc'},
+    ]
+
+    assert _latest_from_simple_files(files) == '2.31.0'
+    assert _latest_from_simple_files([{'filename': 'pkg-1.0b1.zip'}]) == '1.0b1'
+    assert _latest_from_simple_files([]) is None
+
+
+def test_latest_from_simple_files_respects_requires_python():
+    """Test that files requiring another Python version are skipped."""
+    files = [
+        {'filename': 'numpy-1.24.4.tar.gz', 'requires-python': '>=3.8'},
+        {'filename': 'numpy-2.0.0.tar.gz', 'requires-python': '>=3.9'},
+        {'filename': 'numpy-2.1.0-cp310-cp310-manylinux.whl', 'requires-python': '>=3.10'},
+        {'filename': 'numpy-2.2.0.tar.gz', 'requires-python': 'not a specifier'},
+    ]
+
+    assert _latest_from_simple_files(files[:3], python_version='3.8.18') == '1.24.4'
+    assert _latest_from_simple_files(files[:3], python_version='3.12.1') == '2.1.0'
+    assert _latest_from_simple_files(files, python_version='3.8.18') == '2.2.0'
+
+
+def fake_response(content_type, payload):
+    """Build a fake urlopen response usable as a context manager."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers.get_content_type.return_value = content_type
+    response.read.return_value = payload
+    return response
+
+
+def test_fetch_latest_uses_simple_api():
+    """Test that a PEP 691 response is parsed without hitting the JSON API."""
+    payload = json.dumps({'files': [{'filename': 'requests-2.31.0-py3-none-any.whl'}]}).encode()
+
+    with patch('urllib.request.urlopen', return_value=fake_response('application/vnd.pypi.simple.v1+json', payload)) as mock_urlopen:
+        assert _fetch_latest('requests') == '2.31.0'
+
+    request = mock_urlopen.call_args.args[0]
+    assert request.full_url == 'https://pypi.org/simple/requests/'
+    assert request.get_header('Accept') == 'application/vnd.pypi.simple.v1+json'
+    assert mock_urlopen.call_count == 1
+
+
+def test_fetch_latest_requests_canonical_name():
+    """Test that non-normalized names are requested by their canonical name."""
+    payload = json.dumps({'files': [{'filename': 'Django-5.0.tar.gz'}]}).encode()
+
+    with patch('urllib.request.urlopen', return_value=fake_response('application/vnd.pypi.simple.v1+json', payload)) as mock_urlopen:
+        assert _fetch_latest('Django') == '5.0'
+
+    assert mock_urlopen.call_args.args[0].full_url == 'https://pypi.org/simple/django/'
+
+
+def test_fetch_latest_falls_back_to_json_api():
+    """Test that a non-PEP 691 response falls back to /pypi/<name>/json."""
+    responses = [
+        fake_response('text/html', b'<html></html>'),
+        fake_response('application/json', json.dumps({'info': {'version': '2.31.0'}}).encode()),
+    ]
+
+    with patch('urllib.request.urlopen', side_effect=responses) as mock_urlopen:
+        assert _fetch_latest('requests') == '2.31.0'
+
+    assert mock_urlopen.call_args_list[1].args[0] == 'https://pypi.org/pypi/requests/json'
+
+
+def test_fetch_latest_unknown_package():
+    """Test that a 404 from PyPI means there is no version to compare against."""
+    not_found = urllib.error.HTTPError('url', 404, 'Not Found', None, None)
+
+    with patch('urllib.request.urlopen', side_effect=not_found):
+        assert _fetch_latest('private-package') is None
+
+
+def test_resolve_jobs_sets_max_workers():
+    """Test that 'cdm resolve -j' reaches DependencyManager.max_workers."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        args = create_parser().parse_args(['--cache-dir', temp_dir, 'resolve', '-j', '3'])
+
+        with patch.object(DependencyManager, 'resolve_dependencies', autospec=True) as mock_resolve, \
+             patch('builtins.print'):
+
+            cmd_resolve(args)
+
+        dm = mock_resolve.call_args.args[0]
+        assert dm.max_workers == 3
+
+
+@pytest.mark.parametrize('jobs', ['0', '-2', 'many'])
+def test_resolve_jobs_rejects_invalid_values(jobs):
+    """Test that non-positive or non-numeric --jobs values are rejected by argparse."""
+    with pytest.raises(SystemExit), patch('sys.stderr'):
+        create_parser().parse_args(['resolve', '-j', jobs])
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
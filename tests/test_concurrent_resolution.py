@@ -0,0 +1,91 @@
+"""
+Test concurrent resolution of multiple requirement sets.
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, 'src')
+
+from chacc.cli import cmd_install, create_parser
+from chacc.manager import DependencyManager
+
+
+def test_repeated_requirements_build_one_dict():
+    """Test that repeated -r flags are read into a single requirements dict."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = os.path.join(temp_dir, 'requirements.txt')
+        second = os.path.join(temp_dir, 'requirements-dev.txt')
+        with open(first, 'w') as f:
+            f.write("requests\n")
+        with open(second, 'w') as f:
+            f.write("pytest\n")
+
+        args = create_parser().parse_args(['--cache-dir', temp_dir, 'install', '-r', first, '-r', second])
+
+        with patch.object(DependencyManager, 'resolve_dependencies', autospec=True) as mock_resolve, \
+             patch('builtins.print'):
+
+            cmd_install(args)
+
+        mock_resolve.assert_called_once()
+        assert mock_resolve.call_args.args[1] == {first: b"requests\n", second: b"pytest\n"}
+
+
+def test_resolve_modules_keeps_input_order():
+    """Test that results follow input order and empty contents resolve to {}."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+
+        def resolve(module_name, requirements_content, upgrade=False):
+            return {module_name: f"=={len(requirements_content)}"}
+
+        requirements = [('first', 'requests'), ('empty', '   \n'), ('second', 'six')]
+        with patch.object(dm, 'resolve_module_dependencies', side_effect=resolve) as mock_resolve:
+            results = asyncio.run(dm._resolve_modules(requirements))
+
+        assert results == [{'first': '==8'}, {}, {'second': '==3'}]
+        assert sorted(call.args[0] for call in mock_resolve.call_args_list) == ['first', 'second']
+
+
+def test_same_named_modules_resolve_concurrently():
+    """Test that modules sharing a name do not overwrite each other's temp files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+        # Both fake pip-compile runs start before either reads its input
+        barrier = threading.Barrier(2, timeout=10)
+
+        def run(cmd, **kwargs):
+            barrier.wait()
+            with open(cmd[-1]) as f:
+                package = f.read().strip()
+            with open(cmd[cmd.index('--output-file') + 1], 'w') as f:
+                f.write(f"{package}==1.0\n")
+            return MagicMock(returncode=0)
+
+        requirements = [('requirements', 'requests'), ('requirements', 'flask')]
+        with patch('chacc.manager.subprocess.run', side_effect=run):
+            results = asyncio.run(dm._resolve_modules(requirements))
+
+        assert results == [{'requests': '==1.0'}, {'flask': '==1.0'}]
+        assert not [name for name in os.listdir(temp_dir) if name.startswith('temp_')]
+
+
+def test_temp_requirements_names_do_not_collide():
+    """Test that module names differing only by path separators use different temp files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+        temp_files = []
+
+        def run(cmd, **kwargs):
+            temp_files.append(cmd[-1])
+            raise RuntimeError("stop after recording the temp file")
+
+        with patch('chacc.manager.subprocess.run', side_effect=run):
+            dm.resolve_module_dependencies('a/b', 'requests')
+            dm.resolve_module_dependencies('a_b', 'requests')
+
+        assert len(set(temp_files)) == 2
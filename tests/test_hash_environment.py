@@ -5,7 +5,7 @@ Test script to verify that hash calculations include environment factors.
 import sys
 sys.path.insert(0, 'src')
 
-from chacc.utils import calculate_module_hash, get_environment_hash
+from chacc.utils import calculate_module_hash, decode_requirements, get_environment_hash
 
 
 def test_hash_includes_environment():
@@ -36,5 +36,13 @@ def test_hash_includes_environment():
     print("\n🎉 Hash environment test completed!")
 
 
+def test_crlf_requirements_hash_like_text():
+    """Test that CRLF requirements hash the same as bytes, text and read_text() content."""
+    text_hash = calculate_module_hash("test_module", "requests\nflask\n")
+
+    assert calculate_module_hash("test_module", decode_requirements(b"requests\r\nflask\r\n")) == text_hash
+    assert calculate_module_hash("test_module", decode_requirements("requests\r\nflask\r\n")) == text_hash
+
+
 if __name__ == "__main__":
     test_hash_includes_environment()
\ No newline at end of file
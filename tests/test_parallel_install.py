@@ -0,0 +1,131 @@
+"""
+Test concurrent wheel prefetching for package installation.
+"""
+
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, 'src')
+
+from chacc.manager import DependencyManager, WHEEL_PREFETCH_WORKERS
+
+
+def completed(returncode=0, stderr='', stdout=''):
+    """Build a fake subprocess.CompletedProcess."""
+    result = MagicMock()
+    result.returncode = returncode
+    result.stderr = stderr
+    result.stdout = stdout
+    return result
+
+
+def pip_command(call):
+    """Return the pip subcommand and arguments of a subprocess.run call."""
+    return call.args[0][3:]
+
+
+def test_multiple_packages_use_prefetched_wheels():
+    """Test that missing packages are fetched as wheels concurrently and installed once."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+
+        with patch('chacc.manager.subprocess.run', return_value=completed()) as mock_run:
+            dm.install_missing_packages({'requests': '==2.31.0', 'idna': '==3.6'}, set())
+
+        commands = [pip_command(call) for call in mock_run.call_args_list]
+        wheel_commands = [command for command in commands if command[0] == 'wheel']
+        install_commands = [command for command in commands if command[0] == 'install']
+
+        assert sorted(command[-1] for command in wheel_commands) == ['idna==3.6', 'requests==2.31.0']
+        assert all('--no-deps' in command for command in wheel_commands)
+        assert len(install_commands) == 1
+        assert '--no-index' in install_commands[0]
+        assert install_commands[0][-2:] == ['requests==2.31.0', 'idna==3.6']
+        assert commands[-1] == ['check']
+
+
+def test_failed_prefetch_falls_back_to_pip_install():
+    """Test that a failed wheel fetch falls back to a regular pip install."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+
+        def run(cmd, **kwargs):
+            return completed(returncode=1 if cmd[3] == 'wheel' else 0, stderr='no wheel')
+
+        with patch('chacc.manager.subprocess.run', side_effect=run) as mock_run:
+            dm.install_missing_packages({'requests': '==2.31.0', 'idna': '==3.6'}, set())
+
+        install_commands = [pip_command(call) for call in mock_run.call_args_list if pip_command(call)[0] == 'install']
+        assert install_commands == [['install', '--quiet', 'requests==2.31.0', 'idna==3.6']]
+
+
+def test_inconsistent_dependencies_fall_back_to_pip_install():
+    """Test that a conflict introduced by the wheel install triggers a regular install."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+
+        # urllib3 is installed but at a version requests==2.31.0 does not accept,
+        # so it is skipped as present and only 'pip check' can notice the conflict
+        check_results = [
+            completed(),
+            completed(returncode=1, stdout="requests 2.31.0 has requirement urllib3<3,>=1.21.1, but you have urllib3 3.0.0.\n"),
+        ]
+
+        def run(cmd, **kwargs):
+            if cmd[3] == 'check':
+                return check_results.pop(0)
+            return completed()
+
+        resolved = {'requests': '==2.31.0', 'idna': '==3.6', 'urllib3': '==2.0.7'}
+        with patch('chacc.manager.subprocess.run', side_effect=run) as mock_run:
+            dm.install_missing_packages(resolved, {'urllib3'})
+
+        commands = [pip_command(call) for call in mock_run.call_args_list]
+        assert commands[-2] == ['check']
+        assert commands[-1] == ['install', '--quiet', 'requests==2.31.0', 'idna==3.6']
+
+
+def test_preexisting_conflicts_do_not_trigger_fallback():
+    """Test that conflicts already present before the install are ignored."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+        existing_conflict = "sphinx 7.0.0 requires docutils, which is not installed.\n"
+
+        def run(cmd, **kwargs):
+            if cmd[3] == 'check':
+                return completed(returncode=1, stdout=existing_conflict)
+            return completed()
+
+        with patch('chacc.manager.subprocess.run', side_effect=run) as mock_run:
+            dm.install_missing_packages({'requests': '==2.31.0', 'idna': '==3.6'}, set())
+
+        commands = [pip_command(call) for call in mock_run.call_args_list]
+        install_commands = [command for command in commands if command[0] == 'install']
+        assert commands.count(['check']) == 2
+        assert len(install_commands) == 1
+        assert '--no-index' in install_commands[0]
+
+
+def test_wheel_prefetch_concurrency_is_bounded():
+    """Test that wheel fetching uses its own small worker bound."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+        resolved = {f'pkg{i}': '==1.0' for i in range(10)}
+
+        with patch('chacc.manager.subprocess.run', return_value=completed()), \
+             patch('chacc.manager.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_executor:
+            dm.install_missing_packages(resolved, set())
+
+        mock_executor.assert_called_once_with(max_workers=WHEEL_PREFETCH_WORKERS)
+
+
+def test_single_package_installs_directly():
+    """Test that a single missing package skips wheel prefetching."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dm = DependencyManager(cache_dir=temp_dir)
+
+        with patch('chacc.manager.subprocess.run', return_value=completed()) as mock_run:
+            dm.install_missing_packages({'requests': '==2.31.0'}, set())
+
+        assert [pip_command(call) for call in mock_run.call_args_list] == [['install', '--quiet', 'requests==2.31.0']]